@@ -6,12 +6,19 @@ Converts all files with CRLF line endings to LF line endings.
 Run from project root: python helper_scripts/convert_crlf_to_lf.py
 """
 
+import json
 import os
+import shutil
 import sys
+from collections import Counter
+from concurrent.futures import (
+    FIRST_COMPLETED, Executor, ThreadPoolExecutor, as_completed, wait,
+)
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 # Directories to skip during conversion
-SKIP_DIRS = {
+SKIP_DIRS = frozenset({
     'node_modules',
     '.git',
     'dist',
@@ -20,10 +27,10 @@ SKIP_DIRS = {
     '__pycache__',
     '.vscode',
     '.idea',
-}
+})
 
 # File extensions to process
-PROCESSABLE_EXTENSIONS = {
+PROCESSABLE_EXTENSIONS = frozenset({
     '.js', '.jsx', '.ts', '.tsx',
     '.json', '.md', '.txt',
     '.py', '.sh', '.bash',
@@ -32,89 +39,283 @@ PROCESSABLE_EXTENSIONS = {
     '.html', '.xml',
     '.env', '.sample',
     '.gitignore', '.eslintrc',
-}
+})
 
-def should_process_file(file_path: Path) -> bool:
+# Extensions without the leading dot, matched against the text after the last '.'
+_EXTENSIONS = frozenset(ext.lstrip('.') for ext in PROCESSABLE_EXTENSIONS)
+
+# Dotfiles processed by exact name
+_SPECIAL_FILES = frozenset({'.gitignore', '.eslintrc', '.cursorrules'})
+
+# Extensions where a bare CR is practically never intended, so deleting
+# every CR is tried first (see to_lf)
+TRANSLATE_EXTENSIONS = frozenset({'.js', '.ts', '.py', '.json', '.md'})
+
+# Read size used when scanning files for CRLF
+CHUNK_SIZE = 64 * 1024
+
+# Leading bytes checked for NUL to detect binary files
+BINARY_SNIFF_SIZE = 4096
+
+# Suffix for the temporary file written before replacing the original
+TMP_SUFFIX = '.__lf_tmp__'
+
+# Sidecar in the root directory recording (mtime_ns, size) of files known to be LF
+CACHE_FILE = '.crlf_cache.json'
+
+# Worker threads for file I/O (the GIL is released while reading/writing)
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files submitted to the pool but not yet tallied; bounds memory on huge trees
+MAX_PENDING = MAX_WORKERS * 4
+
+class FileJob(NamedTuple):
+    """A file that needs reading, with the stat key it had when discovered (None if stat failed)."""
+    path: str
+    relative_path: str
+    key: Optional[List[int]]
+
+def discover(root: str) -> Iterator[os.DirEntry]:
+    """
+    Recursively yield regular file entries below root, pruning SKIP_DIRS.
+
+    Directories that cannot be listed are reported and skipped, as os.walk
+    does, instead of aborting the scan.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError as e:
+        print(f"  [WARN] Cannot read directory {root}: {e}")
+        return
+
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    yield from discover(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+def should_process_file(entry: os.DirEntry) -> bool:
     """Determine if a file should be processed."""
-    if not file_path.is_file():
-        return False
+    name = entry.name
+    _, dot, ext = name.rpartition('.')
 
-    if file_path.suffix in PROCESSABLE_EXTENSIONS:
+    if dot and ext in _EXTENSIONS:
         return True
 
-    if file_path.name in {'.gitignore', '.eslintrc', '.cursorrules'}:
-        return True
+    return name in _SPECIAL_FILES
 
-    return False
+def filter_extensions(entries: Iterable[os.DirEntry]) -> Iterator[os.DirEntry]:
+    """Yield only the entries should_process_file accepts."""
+    for entry in entries:
+        if should_process_file(entry):
+            yield entry
 
-def has_crlf(file_path: Path) -> bool:
-    """Check if a file contains CRLF line endings."""
-    try:
-        with open(file_path, 'rb') as f:
-            return b'\r\n' in f.read()
-    except Exception as e:
-        print(f"  [WARN] Error reading {file_path}: {e}")
-        return False
+def to_lf(content: bytes, extension: str) -> bytes:
+    """
+    Return content with CRLF line endings replaced by LF.
+
+    For TRANSLATE_EXTENSIONS every CR is deleted in a single translate()
+    pass. If that removed more CRs than there are CRLF pairs, the file has
+    bare CRs that must be kept, so it falls back to replace().
+    """
+    if extension in TRANSLATE_EXTENSIONS:
+        new_content = content.translate(None, b'\r')
+        if len(content) - len(new_content) == content.count(b'\r\n'):
+            return new_content
+
+    return content.replace(b'\r\n', b'\n')
 
-def convert_to_lf(file_path: Path) -> bool:
-    """Convert CRLF line endings to LF."""
+def process_file(file_path: str) -> Tuple[str, Optional[str]]:
+    """
+    Convert CRLF line endings to LF in a single read pass.
+
+    The file is streamed in chunks until the first CRLF is seen, so files
+    that are already LF are never held in memory whole. Only files that
+    need converting are read fully and rewritten.
+
+    Safe to call from worker threads: nothing is printed here.
+
+    Returns:
+        Tuple of (status, error message). Status is 'converted',
+        'skipped' (already LF), 'binary' or 'error'.
+    """
     try:
         with open(file_path, 'rb') as f:
+            # A NUL byte near the start means binary, whatever the extension
+            chunk = f.read(BINARY_SNIFF_SIZE)
+            if b'\x00' in chunk:
+                return 'binary', None
+
+            last = b''
+            while chunk:
+                # Keep one byte of overlap to catch a CRLF split across chunks
+                if b'\r\n' in last[-1:] + chunk:
+                    break
+                last = chunk
+                chunk = f.read(CHUNK_SIZE)
+            else:
+                return 'skipped', None
+
+            f.seek(0)
             content = f.read()
 
-        content = content.replace(b'\r\n', b'\n')
+        new_content = to_lf(content, os.path.splitext(file_path)[1])
+        if len(new_content) == len(content):
+            return 'skipped', None
 
-        with open(file_path, 'wb') as f:
-            f.write(content)
+        # Write to a sibling temp file and rename over the original, so an
+        # interrupted run never leaves a truncated file behind
+        tmp_path = f"{file_path}{TMP_SUFFIX}"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(new_content)
+            shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
 
-        return True
+        return 'converted', None
     except Exception as e:
-        print(f"  [ERROR] Failed converting {file_path}: {e}")
-        return False
+        return 'error', str(e)
+
+def load_cache(cache_path: str) -> Dict[str, List[int]]:
+    """Load the {relative path: [mtime_ns, size]} cache, or {} if unusable."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def save_cache(cache_path: str, cache: Dict[str, List[int]]) -> None:
+    """Write the cache atomically; a failure only costs a full scan next time."""
+    tmp_path = f"{cache_path}{TMP_SUFFIX}"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+            json.dump(cache, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"  [WARN] Could not write {cache_path}: {e}")
+
+def check_cache(
+    entries: Iterable[os.DirEntry],
+    root_prefix_len: int,
+    cache: Dict[str, List[int]],
+) -> Iterator[Tuple[FileJob, bool]]:
+    """
+    Yield (job, cached) for every entry, where cached is True if its
+    (mtime_ns, size) still match the last run. The cache file itself is
+    never yielded.
+    """
+    for entry in entries:
+        relative_path = entry.path[root_prefix_len:]
+        if relative_path == CACHE_FILE:
+            continue
+
+        # On POSIX this is a real lstat(); scandir only caches the file type.
+        # A file that vanished or cannot be stat'ed is handed to process_file
+        # without a key, which reports the error and keeps it out of the cache.
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            yield FileJob(entry.path, relative_path, None), False
+            continue
+
+        key = [st.st_mtime_ns, st.st_size]
+        yield FileJob(entry.path, relative_path, key), cache.get(relative_path) == key
+
+def convert(
+    jobs: Iterable[Tuple[FileJob, bool]], executor: Executor
+) -> Iterator[Tuple[FileJob, str, Optional[str]]]:
+    """
+    Run process_file on executor for every uncached job, yielding
+    (job, status, error) as each finishes. Cached jobs pass straight
+    through with status 'cached'.
+
+    At most MAX_PENDING files are in flight, so results start flowing
+    while the tree is still being walked.
+    """
+    pending = {}
+    for job, cached in jobs:
+        if cached:
+            yield job, 'cached', None
+            continue
+
+        pending[executor.submit(process_file, job.path)] = job
+        if len(pending) >= MAX_PENDING:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield (pending.pop(future),) + future.result()
+
+    for future in as_completed(pending):
+        yield (pending[future],) + future.result()
 
 def scan_and_convert(root_dir: Path) -> None:
     """Scan directory tree and convert files."""
-    converted_count = 0
-    skipped_count = 0
-    error_count = 0
-    total_scanned = 0
+    stats = Counter()
+    messages = []
 
     print(f"\nScanning for CRLF line endings in: {root_dir}")
     print(f"Skipping directories: {', '.join(sorted(SKIP_DIRS))}\n")
 
-    for root, dirs, files in os.walk(root_dir):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    # Every scanned path starts with this, so display paths are a cheap slice
+    root = str(root_dir)
+    root_prefix_len = len(os.path.join(root, ''))
 
-        for file_name in files:
-            file_path = Path(root) / file_name
+    # Files whose mtime and size match the last run are already LF
+    cache_path = os.path.join(root, CACHE_FILE)
+    cache = load_cache(cache_path)
+    new_cache = {}
 
-            if not should_process_file(file_path):
-                continue
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        pipeline = convert(
+            check_cache(filter_extensions(discover(root)), root_prefix_len, cache),
+            executor,
+        )
 
-            total_scanned += 1
+        # Tally from the main thread only; output is buffered and written once
+        for job, result, error in pipeline:
+            stats[result] += 1
+            if result != 'cached':
+                stats['scanned'] += 1
 
-            if has_crlf(file_path):
-                relative_path = file_path.relative_to(root_dir)
-                print(f"  Converting: {relative_path}")
+            if result == 'converted':
+                messages.append(f"  Converting: {job.relative_path}")
+                try:
+                    st = os.stat(job.path)
+                    new_cache[job.relative_path] = [st.st_mtime_ns, st.st_size]
+                except OSError:
+                    pass
+            elif result == 'error':
+                messages.append(f"  [ERROR] Failed converting {job.path}: {error}")
+            elif job.key is not None:
+                new_cache[job.relative_path] = job.key
 
-                if convert_to_lf(file_path):
-                    converted_count += 1
-                else:
-                    error_count += 1
-            else:
-                skipped_count += 1
+    save_cache(cache_path, new_cache)
+
+    if messages:
+        messages.sort()
+        sys.stdout.write('\n'.join(messages) + '\n')
 
     print("\n" + "=" * 60)
     print("Conversion Summary")
     print("=" * 60)
-    print(f"  Files converted:     {converted_count}")
-    print(f"  Files already LF:    {skipped_count}")
-    print(f"  Errors:              {error_count}")
-    print(f"  Total files scanned: {total_scanned}")
+    print(f"  Files converted:     {stats['converted']}")
+    print(f"  Files already LF:    {stats['skipped']}")
+    print(f"  Binary files:        {stats['binary']}")
+    print(f"  Errors:              {stats['error']}")
+    print(f"  Total files scanned: {stats['scanned']}")
+    print(f"  Unchanged (cached):  {stats['cached']}")
     print("=" * 60)
 
-    if converted_count > 0:
-        print(f"\nSuccess: Converted {converted_count} file(s) to LF.")
+    if stats['converted'] > 0:
+        print(f"\nSuccess: Converted {stats['converted']} file(s) to LF.")
     else:
         print("\nNo conversion needed. All files already use LF.")
 
@@ -14,7 +14,27 @@ import os
 import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple, Optional
+
+try:
+    import ijson
+except ImportError:  # Optional: only used to stream large problems.json files
+    ijson = None
+
+# Errors raised for malformed problems.json by whichever parser is in use
+JSON_ERRORS = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson is not None else ())
+
+# ESLint 'indent' rule message, e.g. "Expected indentation of 4 spaces but found 6."
+_INDENT_RE = re.compile(r'Expected indentation of (\d+) spaces but found (\d+)\.')
+
+# Shared indentation strings, indexed by width
+_PAD = tuple(' ' * n for n in range(129))
+
+# VS Code resource drive prefix on Windows, e.g. "/k:/" or "/C:/"
+_VSCODE_DRIVE_RE = re.compile(r'^/([a-zA-Z]):/')
+
+# Maps VS Code's forward slashes to the native path separator
+_PATH_TRANS = str.maketrans('/', os.sep)
 
 def parse_indentation_message(message: str) -> Tuple[Optional[int], Optional[int]]:
     """
@@ -26,25 +46,36 @@ def parse_indentation_message(message: str) -> Tuple[Optional[int], Optional[int
     Returns:
         Tuple of (expected_spaces, found_spaces) or (None, None) if parse fails
     """
-    match = re.match(r'Expected indentation of (\d+) spaces but found (\d+)\.', message)
+    match = _INDENT_RE.match(message)
     if match:
         return int(match.group(1)), int(match.group(2))
     return None, None
 
-def load_problems(problems_file: Path) -> List[Dict]:
-    """Load problems from JSON file."""
+def iter_problems(f: BinaryIO) -> Iterator[Dict]:
+    """
+    Yield problems from an open problems.json file.
+    
+    Streams one problem at a time when ijson is installed, otherwise
+    falls back to loading the whole array with the json module.
+    """
+    if ijson is not None:
+        yield from ijson.items(f, 'item')
+    else:
+        yield from json.load(f)
+
+def load_problems(problems_file: Path) -> Dict[str, List[Dict]]:
+    """Load problems from JSON file, grouping indentation problems as they are read."""
     try:
-        with open(problems_file, 'r', encoding='utf-8') as f:
-            problems = json.load(f)
-        return problems
+        with open(problems_file, 'rb') as f:
+            return group_indentation_problems(iter_problems(f))
     except FileNotFoundError:
         print(f"[ERROR] {problems_file} not found")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except JSON_ERRORS as e:
         print(f"[ERROR] Invalid JSON in {problems_file}: {e}")
         sys.exit(1)
 
-def group_indentation_problems(problems: List[Dict]) -> Dict[str, List[Dict]]:
+def group_indentation_problems(problems: Iterable[Dict]) -> Dict[str, List[Dict]]:
     """
     Group indentation problems by file.
     
@@ -58,12 +89,9 @@ def group_indentation_problems(problems: List[Dict]) -> Dict[str, List[Dict]]:
         if problem.get('code', {}).get('value') != 'indent':
             continue
         
-        # Get file path (remove /K: prefix if present)
+        # Get file path ("/k:/src/a.js" -> "k:/src/a.js", then native separators)
         resource = problem.get('resource', '')
-        if resource.startswith('/K:'):
-            resource = 'K:' + resource[3:]
-        
-        file_path = resource.replace('/', os.sep)
+        file_path = _VSCODE_DRIVE_RE.sub(r'\1:/', resource).translate(_PATH_TRANS)
         
         # Parse indentation info
         message = problem.get('message', '')
@@ -85,6 +113,10 @@ def group_indentation_problems(problems: List[Dict]) -> Dict[str, List[Dict]]:
     
     return grouped
 
+def _pad(width: int) -> str:
+    """Return a string of width spaces, reusing the cached ones where possible."""
+    return _PAD[width] if width < len(_PAD) else ' ' * width
+
 def fix_line_indentation(line: str, expected: int, found: int) -> str:
     """
     Fix indentation on a single line.
@@ -97,14 +129,12 @@ def fix_line_indentation(line: str, expected: int, found: int) -> str:
     Returns:
         Fixed line
     """
-    # Count leading spaces
-    leading_spaces = len(line) - len(line.lstrip(' '))
+    found_pad = _pad(found)
     
-    # Only fix if it matches the 'found' count
-    if leading_spaces == found:
+    # Only fix if the line starts with exactly 'found' spaces
+    if line.startswith(found_pad) and line[found:found + 1] != ' ':
         # Replace with expected spaces
-        fixed_line = ' ' * expected + line.lstrip(' ')
-        return fixed_line
+        return _pad(expected) + line[found:]
     
     return line
 
@@ -128,19 +158,18 @@ def fix_file_indentation(file_path: str, problems: List[Dict]) -> bool:
         with open(file_path, 'r', encoding='utf-8', newline='') as f:
             lines = f.readlines()
         
-        original_content = ''.join(lines)
         modified = False
         
-        # Sort problems by line number (descending) to avoid line number shifts
-        sorted_problems = sorted(problems, key=lambda p: p['line'], reverse=True)
+        # Index problems by line number; fixes never add or remove lines,
+        # so each one can be applied in place without sorting
+        by_line = {problem['line']: problem for problem in problems}
         
         # Fix each line
-        for problem in sorted_problems:
-            line_num = problem['line']
+        for line_num, problem in by_line.items():
             expected = problem['expected']
             found = problem['found']
             
-            if 1 <= line_num <= len(lines):
+            if line_num is not None and 1 <= line_num <= len(lines):
                 original_line = lines[line_num - 1]
                 fixed_line = fix_line_indentation(original_line, expected, found)
                 
@@ -186,11 +215,8 @@ def main():
     print(f"Reading problems from: {problems_file}")
     print()
     
-    # Load problems
-    problems = load_problems(problems_file)
-    
-    # Group by file
-    grouped_problems = group_indentation_problems(problems)
+    # Load problems, grouped by file
+    grouped_problems = load_problems(problems_file)
     
     if not grouped_problems:
         print("[SUCCESS] No indentation problems found!")
@@ -10,78 +10,86 @@ from pathlib import Path
 from datetime import datetime
 
 
+# Output buffer size; lines are written as the tree is walked, so a large
+# buffer keeps write() calls rare without holding the whole map in memory
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+# Exact file/directory names to leave out of the map
+IGNORE_NAMES = frozenset({
+    'node_modules',
+    '.git',
+    '__pycache__',
+    '.pytest_cache',
+    'venv',
+    'env',
+    '.env',
+    'dist',
+    'build',
+    '.vscode',
+    '.idea',
+    '.DS_Store'
+})
+
+# File name suffixes to leave out of the map
+IGNORE_SUFFIXES = ('.pyc',)
+
+
 def should_ignore(path_name):
     """Determine if a path should be ignored based on common patterns."""
-    ignore_patterns = {
-        'node_modules',
-        '.git',
-        '__pycache__',
-        '.pytest_cache',
-        'venv',
-        'env',
-        '.env',
-        'dist',
-        'build',
-        '.vscode',
-        '.idea',
-        '*.pyc',
-        '.DS_Store'
-    }
-    
-    return any(pattern in path_name for pattern in ignore_patterns)
+    return path_name in IGNORE_NAMES or path_name.endswith(IGNORE_SUFFIXES)
 
 
-def map_directory_structure(root_path, prefix="", is_last=True):
+def map_directory_structure(root_path, prefix="", is_last=True, exclude=frozenset()):
     """
     Recursively map directory structure with tree-like formatting.
     
     Args:
-        root_path: Path object of the directory to map
+        root_path: Path or path string of the directory to map
         prefix: String prefix for tree formatting
         is_last: Boolean indicating if this is the last item in current level
+        exclude: Entry names to leave out of this directory only (not subdirectories)
     
-    Returns:
-        List of formatted strings representing the directory structure
+    Yields:
+        Formatted strings representing the directory structure, one per line
     """
-    lines = []
-    
     # Get the directory/file name
     if prefix == "":
         # Root directory
-        lines.append(f"{root_path.name}/")
-        prefix = ""
+        yield f"{Path(root_path).name}/"
     
     try:
-        # Get all items in the directory, sorted (directories first, then files)
-        items = sorted(root_path.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower()))
-        
-        # Filter out ignored items
-        items = [item for item in items if not should_ignore(item.name)]
-        
-        for index, item in enumerate(items):
-            is_last_item = (index == len(items) - 1)
-            
-            # Create the tree branch characters
-            if is_last_item:
-                current_prefix = prefix + "└── "
-                next_prefix = prefix + "    "
-            else:
-                current_prefix = prefix + "├── "
-                next_prefix = prefix + "│   "
-            
-            if item.is_dir():
-                # Directory
-                lines.append(f"{current_prefix}{item.name}/")
-                # Recursively process subdirectory
-                lines.extend(map_directory_structure(item, next_prefix, is_last_item))
-            else:
-                # File
-                lines.append(f"{current_prefix}{item.name}")
-                
+        # Get all items in the directory, sorted (directories first, then files).
+        # DirEntry.is_dir() uses the type cached by scandir, so no extra stat().
+        with os.scandir(root_path) as it:
+            items = sorted(
+                (entry for entry in it
+                 if not should_ignore(entry.name) and entry.name not in exclude),
+                key=lambda e: (not e.is_dir(follow_symlinks=False), e.name.lower())
+            )
     except PermissionError:
-        lines.append(f"{prefix}[Permission Denied]")
+        yield f"{prefix}[Permission Denied]"
+        return
     
-    return lines
+    for index, item in enumerate(items):
+        is_last_item = (index == len(items) - 1)
+        
+        # Create the tree branch characters
+        if is_last_item:
+            current_prefix = prefix + "└── "
+            next_prefix = prefix + "    "
+        else:
+            current_prefix = prefix + "├── "
+            next_prefix = prefix + "│   "
+        
+        if item.is_dir(follow_symlinks=False):
+            # Directory
+            yield f"{current_prefix}{item.name}/"
+            # Recursively process subdirectory
+            yield from map_directory_structure(item.path, next_prefix, is_last_item)
+        else:
+            # File
+            yield f"{current_prefix}{item.name}"
 
 
 def create_file_structure_doc(output_file="file_structure.txt"):
@@ -97,9 +105,6 @@ def create_file_structure_doc(output_file="file_structure.txt"):
     
     print(f"Mapping file structure from: {project_root}")
     
-    # Generate the structure
-    structure_lines = map_directory_structure(project_root)
-    
     # Create header for the document
     header = [
         "=" * 80,
@@ -111,17 +116,31 @@ def create_file_structure_doc(output_file="file_structure.txt"):
         "",
     ]
     
-    # Combine header and structure
-    full_content = "\n".join(header + structure_lines)
-    
-    # Write to file in the project root
+    # Write to a temp file in the project root, one structure line at a time,
+    # then swap it in so a failed walk never clobbers the previous output.
+    # The temp file is left out of the map it is being written into.
     output_path = project_root / output_file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(full_content)
+    tmp_path = project_root / f".{output_file}.tmp"
+    line_count = 0
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='\n',
+                  buffering=WRITE_BUFFER_SIZE) as f:
+            f.write("\n".join(header) + "\n")
+            for line in map_directory_structure(project_root, exclude={tmp_path.name}):
+                f.write(line)
+                f.write("\n")
+                line_count += 1
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
     
     print(f"✓ File structure mapped successfully!")
     print(f"✓ Output saved to: {output_path}")
-    print(f"✓ Total lines: {len(structure_lines)}")
+    print(f"✓ Total lines: {line_count}")
 
 
 if __name__ == "__main__":
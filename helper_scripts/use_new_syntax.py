@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 import json
 import re
+from collections import defaultdict
+from itertools import groupby
 from pathlib import Path
 
+# VS Code drive-letter resource prefix on Windows, e.g. "/k:/"
+_DRIVE_RE = re.compile(r'^/[a-zA-Z]:/')
+
+# Robust regex: matches "The class `old` can be written as `new`" or variants
+_TW_RE = re.compile(r'`([^`]+)`\s+(?:can be written as|→)\s+`([^`]+)`')
+
 def parse_fixes(problems_json_path):
     """Parse problems.json, return list of (file_path, line, col_start, col_end, old_class, new_class)"""
     fixes = []
@@ -15,14 +23,13 @@ def parse_fixes(problems_json_path):
             raw_resource = problem['resource']
 
             # VS Code uses /k:/ style paths on Windows — normalize them
-            if re.match(r'^/[a-zA-Z]:/', raw_resource):
+            if _DRIVE_RE.match(raw_resource):
                 raw_resource = raw_resource.lstrip('/')
 
             resource = Path(raw_resource)
             message = problem['message']
             
-            # Robust regex: matches "The class `old` can be written as `new`" or variants
-            match = re.search(r'`([^`]+)`\s+(?:can be written as|→)\s+`([^`]+)`', message)
+            match = _TW_RE.search(message)
             if match:
                 old_class, new_class = match.groups()
                 line = problem['startLineNumber'] - 1  # 1-based to 0-based
@@ -33,30 +40,69 @@ def parse_fixes(problems_json_path):
     
     return fixes
 
-def apply_fix(file_path, line, col_start, col_end, old_class, new_class):
-    """Replace exact span in file with new class"""
+def line_offsets(data):
+    """Return the byte offset at which each line of data starts"""
+    offsets = [0]
+    pos = data.find(b'\n')
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = data.find(b'\n', pos + 1)
+    # A trailing newline ends the last line rather than starting a new one
+    if offsets[-1] == len(data):
+        offsets.pop()
+    return offsets
+
+def apply_fixes(file_path, file_fixes):
+    """Replace exact spans in one file with new classes, reading and writing it once
+
+    file_fixes is a list of (line, col_start, col_end, old_class, new_class).
+    Only the edited lines are decoded and re-encoded; every other byte, including
+    the file's existing line endings, is written back untouched.
+    """
     if not file_path.exists():
         print(f"❌ File not found: {file_path}")
         return
     
-    lines = file_path.read_text(encoding='utf-8').splitlines()
-    if 0 <= line < len(lines):
-        line_content = lines[line]
-        if col_start < len(line_content) and col_end <= len(line_content):
-            # Verify the span contains the old class
-            span = line_content[col_start:col_end]
-            if old_class in span:
-                new_line = (line_content[:col_start] + new_class + 
-                           line_content[col_end:])
-                lines[line] = new_line
-                file_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
-                print(f"✅ Fixed {file_path.name}:{line+1}:{col_start+1}: '{old_class}' → '{new_class}'")
+    data = bytearray(file_path.read_bytes())
+    offsets = line_offsets(data)
+    modified = False
+    
+    # Bottom-up, right-to-left so earlier byte offsets and columns stay valid
+    fixes_by_line = groupby(
+        sorted(file_fixes, key=lambda fix: (fix[0], fix[1]), reverse=True),
+        key=lambda fix: fix[0])
+    
+    for line, line_fixes in fixes_by_line:
+        if not 0 <= line < len(offsets):
+            print(f"⚠️  Line {line+1} out of bounds in {file_path}")
+            continue
+        
+        start = offsets[line]
+        end = offsets[line + 1] if line + 1 < len(offsets) else len(data)
+        raw = bytes(data[start:end])
+        eol = 2 if raw.endswith(b'\r\n') else 1 if raw.endswith(b'\n') else 0
+        line_content = raw[:len(raw) - eol].decode('utf-8')
+        original_line = line_content
+        
+        for _, col_start, col_end, old_class, new_class in line_fixes:
+            if col_start < len(line_content) and col_end <= len(line_content):
+                # Verify the span contains the old class
+                span = line_content[col_start:col_end]
+                if old_class in span:
+                    line_content = (line_content[:col_start] + new_class + 
+                                    line_content[col_end:])
+                    print(f"✅ Fixed {file_path.name}:{line+1}:{col_start+1}: '{old_class}' → '{new_class}'")
+                else:
+                    print(f"⚠️  Expected '{old_class}' not in span '{span}' at {file_path}:{line+1}")
             else:
-                print(f"⚠️  Expected '{old_class}' not in span '{span}' at {file_path}:{line+1}")
-        else:
-            print(f"⚠️  Range out of bounds in {file_path}:{line+1}")
-    else:
-        print(f"⚠️  Line {line+1} out of bounds in {file_path}")
+                print(f"⚠️  Range out of bounds in {file_path}:{line+1}")
+        
+        if line_content != original_line:
+            data[start:end - eol] = line_content.encode('utf-8')
+            modified = True
+    
+    if modified:
+        file_path.write_bytes(data)
 
 if __name__ == '__main__':
     SCRIPT_DIR = Path(__file__).resolve().parent
@@ -74,7 +120,13 @@ if __name__ == '__main__':
         exit(0)
     
     print(f"🔍 Found {len(fixes)} Tailwind fixes to apply...")
-    for fix in fixes:
-        apply_fix(*fix)
+    
+    # Group by file so each file is read and written once
+    fixes_by_file = defaultdict(list)
+    for file_path, *fix in fixes:
+        fixes_by_file[file_path].append(tuple(fix))
+    
+    for file_path, file_fixes in fixes_by_file.items():
+        apply_fixes(file_path, file_fixes)
     
     print("\n🎉 Done! Check files, then: npm run dev")